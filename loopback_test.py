@@ -23,97 +23,414 @@ Test patterns include:
 - Walking 0s (0xFE, 0xFD, 0xFB, 0xF7, 0xEF, 0xDF, 0xBF, 0x7F)
 """
 
+import contextlib
+from dataclasses import dataclass
+import io
+import logging
+import logging.handlers
+import queue
 import nidaqmx
-from nidaqmx.constants import LineGrouping
-import time
+import numpy as np
+from nidaqmx.constants import AcquisitionType, Edge, LineGrouping
+from nidaqmx.stream_readers import DigitalSingleChannelReader
+from nidaqmx.stream_writers import DigitalSingleChannelWriter
 import sys
 
 
+# Sample clock rate (Hz) for the hardware-timed pattern transfers
+_SAMPLE_RATE = 1_000_000
+
+
+# Test patterns, built once at import time
+_TEST_PATTERNS = (
+    # Basic patterns
+    0x00,  # All zeros
+    0xFF,  # All ones
+    0xAA,  # Alternating 10101010
+    0x55,  # Alternating 01010101
+    # Walking 1s
+    *(1 << i for i in range(8)),
+    # Walking 0s
+    *(0xFF ^ (1 << i) for i in range(8)),
+    # Additional patterns
+    0x0F,  # Lower nibble
+    0xF0,  # Upper nibble
+    0x33,  # 00110011
+    0xCC,  # 11001100
+)
+
+# Reduced pattern set for fast mode: walking 1s and 0s drive every line both
+# high and low with every neighbour at the opposite level, which covers the
+# remaining patterns
+_FAST_TEST_PATTERNS = (
+    *(1 << i for i in range(8)),
+    *(0xFF ^ (1 << i) for i in range(8)),
+    0xAA,
+    0x55,
+)
+
+# Per-pattern result codes
+_RESULT_PASS = 0
+_RESULT_FAIL = 1
+_RESULT_ERROR = 2
+_RESULT_NOT_RUN = 3  # Direction skipped after an aborted run
+_RESULT_NAMES = ("PASS", "FAIL", "ERROR", "NOT RUN")
+
+
+@dataclass(slots=True)
+class TestResult:
+    """Result of one test pattern in one direction."""
+    test: str
+    pattern: int
+    expected: int
+    actual: int | None
+    result: str
+    error: str | None = None
+
+
+def _format_lines(mask):
+    """
+    Format the set bits of an 8-bit mask as a list of line numbers.
+    
+    Args:
+        mask: 8-bit value with one bit set per line
+        
+    Returns:
+        Comma-separated line numbers, e.g. "2, 5"
+    """
+    return ", ".join(str(i) for i in range(8) if mask & (1 << i))
+
+
 class NI6535LoopbackTest:
-    def __init__(self, device_name="Dev1"):
+    # Test directions as (write port, read port, name). Each port pair
+    # (0 <-> 2, 1 <-> 3) is two consecutive entries, and results are
+    # stored in this order.
+    DIRECTIONS = (
+        (0, 2, "Port 0 -> Port 2"),
+        (2, 0, "Port 2 -> Port 0"),
+        (1, 3, "Port 1 -> Port 3"),
+        (3, 1, "Port 3 -> Port 1"),
+    )
+    
+    def __init__(self, device_name="Dev1", fast_mode=False):
         """
         Initialize the loopback test.
         
         Args:
             device_name: Name of the NI DAQ device (default: "Dev1")
+            fast_mode: Test with the reduced pattern set (default: False)
         """
         self.device_name = device_name
-        self.test_results = []
+        self.fast_mode = fast_mode
+        self._patterns = _FAST_TEST_PATTERNS if fast_mode else _TEST_PATTERNS
+        self._pattern_array = np.array(self._patterns, dtype=np.uint8)
+        # Results are stored as parallel arrays with one slot per
+        # (direction, pattern), laid out direction-major
+        self._dir_ids = {(write_port_num, read_port_num): i
+                         for i, (write_port_num, read_port_num, _)
+                         in enumerate(self.DIRECTIONS)}
+        total_expected = len(self.DIRECTIONS) * len(self._patterns)
+        self._res_dir = np.repeat(
+            np.arange(len(self.DIRECTIONS), dtype=np.uint8),
+            len(self._patterns)
+        )
+        self._res_pattern = np.tile(self._pattern_array, len(self.DIRECTIONS))
+        self._res_actual = np.empty(total_expected, np.int16)  # -1 for ERROR
+        self._res_code = np.full(total_expected, _RESULT_NOT_RUN, np.uint8)
+        self._res_errors = {}  # direction id -> error message
+        # Physical channel names, formatted once per port
+        self._phys = {p: f"{device_name}/port{p}" for p in (0, 1, 2, 3)}
+        # Internal terminal, so no connector pin is driven by the clock
+        self._do_clock = f"/{device_name}/do/SampleClock"
+        self._do_start_trigger = f"/{device_name}/do/StartTrigger"
+        self._do_tasks = {}
+        self._di_tasks = {}
+        # Stream writers/readers and receive buffers for the cached tasks
+        self._writers = {}
+        self._readers = {}
+        self._rx_bufs = {}
+        # Progress is queued and written to stdout by a listener thread
+        # while a test is running (see _progress_log)
+        self._log = logging.getLogger("loopback")
+        self._log_queue = queue.SimpleQueue()
+        self._log_handler = logging.handlers.QueueHandler(self._log_queue)
+        self._log_listener = logging.handlers.QueueListener(
+            self._log_queue, logging.StreamHandler(sys.stdout)
+        )
+        self._log_active = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Close all cached DAQmx tasks.
+        """
+        for tasks in (self._do_tasks, self._di_tasks):
+            for task in tasks.values():
+                task.close()
+            tasks.clear()
+        self._writers.clear()
+        self._readers.clear()
+        self._rx_bufs.clear()
+
+    def _get_do_task(self, port_number):
+        """
+        Get the cached digital output task for a port, creating it on first use.
         
-    def get_test_patterns(self):
+        Args:
+            port_number: Port number (0-3)
+            
+        Returns:
+            nidaqmx.Task with the entire port added as an output channel
         """
-        Generate a comprehensive set of test patterns.
+        task = self._do_tasks.get(port_number)
+        if task is None:
+            task = nidaqmx.Task()
+            # Close the task if any part of its configuration fails, e.g.
+            # for a wrong device name
+            try:
+                # Add digital output lines for the entire port
+                task.do_channels.add_do_chan(
+                    self._phys[port_number],
+                    line_grouping=LineGrouping.CHAN_FOR_ALL_LINES
+                )
+                # Generate one sample per test pattern
+                task.timing.cfg_samp_clk_timing(
+                    rate=_SAMPLE_RATE,
+                    sample_mode=AcquisitionType.FINITE,
+                    samps_per_chan=len(self._patterns)
+                )
+                self._writers[port_number] = DigitalSingleChannelWriter(
+                    task.out_stream, auto_start=False
+                )
+            except BaseException:
+                task.close()
+                raise
+            self._do_tasks[port_number] = task
+        return task
+
+    def _get_di_task(self, port_number):
+        """
+        Get the cached digital input task for a port, creating it on first use.
         
+        Args:
+            port_number: Port number (0-3)
+            
         Returns:
-            List of 8-bit test patterns
+            nidaqmx.Task with the entire port added as an input channel
         """
-        patterns = []
+        task = self._di_tasks.get(port_number)
+        if task is None:
+            task = nidaqmx.Task()
+            try:
+                # Add digital input lines for the entire port
+                task.di_channels.add_di_chan(
+                    self._phys[port_number],
+                    line_grouping=LineGrouping.CHAN_FOR_ALL_LINES
+                )
+                # Acquire one sample per test pattern on the output sample
+                # clock. Outputs update on the rising edge; sampling on the
+                # falling edge gives the loopback wiring half a clock period
+                # to settle.
+                task.timing.cfg_samp_clk_timing(
+                    rate=_SAMPLE_RATE,
+                    source=self._do_clock,
+                    active_edge=Edge.FALLING,
+                    sample_mode=AcquisitionType.FINITE,
+                    samps_per_chan=len(self._patterns)
+                )
+                # Start with the output so sample N in matches sample N out
+                task.triggers.start_trigger.cfg_dig_edge_start_trig(
+                    self._do_start_trigger
+                )
+                self._readers[port_number] = DigitalSingleChannelReader(
+                    task.in_stream
+                )
+                self._rx_bufs[port_number] = np.empty(len(self._patterns),
+                                                      dtype=np.uint8)
+            except BaseException:
+                task.close()
+                raise
+            self._di_tasks[port_number] = task
+        return task
+
+    @property
+    def test_results(self):
+        """
+        List of TestResult records, one per pattern per direction tested.
         
-        # Basic patterns
-        patterns.append(0x00)  # All zeros
-        patterns.append(0xFF)  # All ones
-        patterns.append(0xAA)  # Alternating 10101010
-        patterns.append(0x55)  # Alternating 01010101
+        Records are built on demand from the result arrays.
+        """
+        return [self._make_result(i)
+                for i in np.flatnonzero(self._res_code != _RESULT_NOT_RUN)]
+    
+    def _make_result(self, i):
+        """
+        Build the TestResult record for one slot of the result arrays.
         
-        # Walking 1s
-        for i in range(8):
-            patterns.append(1 << i)
-            
-        # Walking 0s
-        for i in range(8):
-            patterns.append(0xFF ^ (1 << i))
+        Args:
+            i: Index into the result arrays
             
-        # Additional patterns
-        patterns.append(0x0F)  # Lower nibble
-        patterns.append(0xF0)  # Upper nibble
-        patterns.append(0x33)  # 00110011
-        patterns.append(0xCC)  # 11001100
+        Returns:
+            TestResult for that direction and pattern
+        """
+        dir_id = int(self._res_dir[i])
+        pattern = int(self._res_pattern[i])
+        code = self._res_code[i]
+        # Only passing and failing slots hold a value read from the port
+        if code == _RESULT_PASS or code == _RESULT_FAIL:
+            actual = int(self._res_actual[i])
+        else:
+            actual = None
+        return TestResult(
+            test=self.DIRECTIONS[dir_id][2],
+            pattern=pattern,
+            expected=pattern,
+            actual=actual,
+            result=_RESULT_NAMES[code],
+            error=self._res_errors.get(dir_id)
+        )
+    
+    def _format_failure(self, result):
+        """
+        Format one non-passing TestResult as a summary line.
         
-        return patterns
+        Args:
+            result: TestResult to format
+            
+        Returns:
+            Summary line without a trailing newline
+        """
+        if result.actual is not None:
+            bad = result.actual ^ result.expected
+            actual_str = f"0x{result.actual:02X} (line(s) {_format_lines(bad)})"
+        else:
+            actual_str = 'ERROR'
+        return (f"  {result.test}: Pattern 0x{result.pattern:02X} - "
+                f"Expected 0x{result.expected:02X}, Got {actual_str}")
     
-    def write_port(self, port_number, value):
+    def _is_catastrophic(self, dir_id):
         """
-        Write a value to the specified port.
+        Check whether a tested direction failed so badly that the remaining
+        directions are not worth running.
+        
+        That is the case when the transfer itself raised (e.g. missing
+        device), or when at most one pattern passed and every line read back
+        wrong at least once (e.g. unplugged cable, where floating inputs may
+        still match 0x00). A direction with passing patterns, or with only
+        some lines failing, is not catastrophic.
         
         Args:
-            port_number: Port number (0-3)
-            value: 8-bit value to write
+            dir_id: Index into DIRECTIONS
+            
+        Returns:
+            True if the remaining directions should be skipped
         """
-        with nidaqmx.Task() as task:
-            # Add digital output lines for the entire port
-            task.do_channels.add_do_chan(
-                f"{self.device_name}/port{port_number}",
-                line_grouping=LineGrouping.CHAN_FOR_ALL_LINES
-            )
-            task.write(value, auto_start=True)
-            # Small delay to ensure data is stable
-            time.sleep(0.001)
+        n = len(self._patterns)
+        res = slice(dir_id * n, (dir_id + 1) * n)
+        codes = self._res_code[res]
+        if np.all(codes == _RESULT_ERROR):
+            return True
+        if np.count_nonzero(codes == _RESULT_PASS) > 1:
+            return False
+        diff = self._res_actual[res] ^ self._res_pattern[res]
+        return int(np.bitwise_or.reduce(diff)) == 0xFF
+    
+    def _print_failures(self):
+        """
+        Print the Failed Tests section of the summary.
+        
+        Only the non-passing slots of the result arrays are visited.
+        """
+        failed_lines = [
+            self._format_failure(self._make_result(i))
+            for i in np.flatnonzero((self._res_code == _RESULT_FAIL) |
+                                    (self._res_code == _RESULT_ERROR))
+        ]
+        self._log.info("\nFailed Tests:\n" + "\n".join(failed_lines))
+    
+    def get_test_patterns(self):
+        """
+        Get the test patterns for the selected mode.
+        
+        Returns:
+            Tuple of 8-bit test patterns
+        """
+        return self._patterns
     
-    def read_port(self, port_number):
+    @contextlib.contextmanager
+    def _progress_log(self):
         """
-        Read a value from the specified port.
+        Route progress records to stdout for the duration of the block.
+        
+        The "loopback" logger is shared by every instance, so this instance's
+        handler is only attached while a test runs. Nested uses (run_tests
+        calling test_port_pair) reuse the outer activation.
+        """
+        if self._log_active:
+            yield
+            return
+        saved_level = self._log.level
+        saved_propagate = self._log.propagate
+        self._log.setLevel(logging.INFO)
+        self._log.propagate = False
+        self._log.addHandler(self._log_handler)
+        self._log_listener.start()
+        self._log_active = True
+        try:
+            yield
+        finally:
+            # Flush any queued progress before returning
+            self._log_active = False
+            self._log.removeHandler(self._log_handler)
+            self._log.propagate = saved_propagate
+            self._log.setLevel(saved_level)
+            self._log_listener.stop()
+    
+    def transfer_patterns(self, write_port_num, read_port_num):
+        """
+        Write all test patterns to one port and read them back from another
+        in a single hardware-timed transfer.
         
         Args:
-            port_number: Port number (0-3)
+            write_port_num: Port number to write to (0-3)
+            read_port_num: Port number to read from (0-3)
             
         Returns:
-            8-bit value read from the port
+            uint8 array of values read, one per pattern. The array is the
+            read port's receive buffer and is overwritten by the next
+            transfer from that port.
         """
-        with nidaqmx.Task() as task:
-            # Add digital input lines for the entire port
-            task.di_channels.add_di_chan(
-                f"{self.device_name}/port{port_number}",
-                line_grouping=LineGrouping.CHAN_FOR_ALL_LINES
+        do_task = self._get_do_task(write_port_num)
+        di_task = self._get_di_task(read_port_num)
+        rx_buf = self._rx_bufs[read_port_num]
+        try:
+            self._writers[write_port_num].write_many_sample_port_byte(
+                self._pattern_array
+            )
+            # Arm the input first so it sees the first output sample clock
+            di_task.start()
+            do_task.start()
+            self._readers[read_port_num].read_many_sample_port_byte(
+                rx_buf, number_of_samples_per_channel=len(rx_buf)
             )
-            # Small delay to ensure data is stable
-            time.sleep(0.001)
-            value = task.read()
-            return value
+            do_task.wait_until_done()
+        finally:
+            do_task.stop()
+            di_task.stop()
+        return rx_buf
     
     def test_port_pair(self, write_port_num, read_port_num, direction_name):
         """
         Test a port pair with all test patterns.
         
+        Results are recorded in the result arrays only when the port pair
+        is one of DIRECTIONS; direction_name is just the report label.
+        
         Args:
             write_port_num: Port number to write to
             read_port_num: Port number to read from
@@ -122,57 +439,61 @@ class NI6535LoopbackTest:
         Returns:
             Tuple of (passed, failed) test counts
         """
-        patterns = self.get_test_patterns()
+        patterns = self._patterns
         passed = 0
         failed = 0
         
-        print(f"\n{direction_name}")
-        print("-" * 60)
+        # Slice of the result arrays belonging to this direction, if any
+        dir_id = self._dir_ids.get((write_port_num, read_port_num))
+        if dir_id is not None:
+            res = slice(dir_id * len(patterns), (dir_id + 1) * len(patterns))
+        else:
+            res = None
         
-        for pattern in patterns:
-            try:
-                # Write pattern to output port
-                self.write_port(write_port_num, pattern)
-                
-                # Read from input port
-                read_value = self.read_port(read_port_num)
-                
-                # Compare
-                if read_value == pattern:
-                    passed += 1
-                    result = "PASS"
-                    self.test_results.append({
-                        'test': direction_name,
-                        'pattern': pattern,
-                        'expected': pattern,
-                        'actual': read_value,
-                        'result': 'PASS'
-                    })
-                else:
-                    failed += 1
-                    result = "FAIL"
-                    self.test_results.append({
-                        'test': direction_name,
-                        'pattern': pattern,
-                        'expected': pattern,
-                        'actual': read_value,
-                        'result': 'FAIL'
-                    })
-                    
-                print(f"  Pattern 0x{pattern:02X}: Expected 0x{pattern:02X}, "
-                      f"Read 0x{read_value:02X} [{result}]")
-                
-            except Exception as e:
-                failed += 1
-                print(f"  Pattern 0x{pattern:02X}: ERROR - {str(e)}")
-                self.test_results.append({
-                    'test': direction_name,
-                    'pattern': pattern,
-                    'expected': pattern,
-                    'actual': None,
-                    'result': 'ERROR',
-                    'error': str(e)
-                })
+        # Per-pattern output is buffered and written once per direction
+        buf = io.StringIO()
+        write = buf.write
+        format_lines = _format_lines
+        write(f"\n{direction_name}\n")
+        write("-" * 60 + "\n")
+        
+        try:
+            # Write all patterns to the output port and read them back
+            read_arr = self.transfer_patterns(write_port_num, read_port_num)
+        except Exception as e:
+            error = str(e)
+            for pattern in patterns:
+                write(f"  Pattern 0x{pattern:02X}: ERROR - {error}\n")
+            failed = len(patterns)
+            if res is not None:
+                self._res_actual[res] = -1
+                self._res_code[res] = _RESULT_ERROR
+                self._res_errors[dir_id] = error
+        else:
+            # Compare all samples at once; each set bit in diff is a line
+            # that read back wrong
+            diff = np.bitwise_xor(read_arr, self._pattern_array)
+            fail_mask = diff != 0
+            failed = int(np.count_nonzero(fail_mask))
+            passed = len(patterns) - failed
+            
+            if res is not None:
+                self._res_actual[res] = read_arr
+                self._res_code[res] = np.where(fail_mask, _RESULT_FAIL,
+                                               _RESULT_PASS)
+            
+            for pattern, read_value, bad in zip(patterns, read_arr.tolist(),
+                                                diff.tolist()):
+                result = f"FAIL: line(s) {format_lines(bad)}" if bad else "PASS"
+                write(f"  Pattern 0x{pattern:02X}: Expected 0x{pattern:02X}, "
+                      f"Read 0x{read_value:02X} [{result}]\n")
+            
+            if failed:
+                bad_lines = int(np.bitwise_or.reduce(diff[fail_mask]))
+                write(f"  Failing line(s): {format_lines(bad_lines)}\n")
+        
+        with self._progress_log():
+            self._log.info(buf.getvalue().rstrip("\n"))
         
         return passed, failed
     
@@ -183,72 +504,66 @@ class NI6535LoopbackTest:
         Returns:
             True if all tests passed, False otherwise
         """
-        print("=" * 60)
-        print("NI PCIe-6535 Loopback Test")
-        print("=" * 60)
-        print(f"Device: {self.device_name}")
-        print("\nTest Configuration:")
-        print("  - Port 1 (output) <-> Port 3 (input)")
-        print("  - Port 2 (output) <-> Port 4 (input)")
-        print(f"\nTotal test patterns: {len(self.get_test_patterns())}")
+        with self._progress_log():
+            self._log.info("=" * 60)
+            self._log.info("NI PCIe-6535 Loopback Test")
+            self._log.info("=" * 60)
+            self._log.info(f"Device: {self.device_name}")
+            self._log.info("\nTest Configuration:")
+            self._log.info("  - Port 1 (output) <-> Port 3 (input)")
+            self._log.info("  - Port 2 (output) <-> Port 4 (input)")
+            self._log.info(f"\nTotal test patterns: {len(self._patterns)}")
         
-        total_passed = 0
-        total_failed = 0
+            total_passed = 0
+            total_failed = 0
+            self._res_code.fill(_RESULT_NOT_RUN)
+            self._res_errors.clear()
         
-        # Test Port 1 -> Port 3
-        passed, failed = self.test_port_pair(0, 2, "Port 0 -> Port 2")
-        total_passed += passed
-        total_failed += failed
+            last_dir_id = len(self.DIRECTIONS) - 1
+            for dir_id, (write_port_num, read_port_num,
+                         direction_name) in enumerate(self.DIRECTIONS):
+                passed, failed = self.test_port_pair(
+                    write_port_num, read_port_num, direction_name
+                )
+                total_passed += passed
+                total_failed += failed
+                if dir_id < last_dir_id and self._is_catastrophic(dir_id):
+                    self._log.info(f"\nAborting remaining phases - "
+                                   f"{direction_name} could not be tested "
+                                   f"or every line failed, check wiring.")
+                    break
         
-        # Test Port 3 -> Port 1
-        passed, failed = self.test_port_pair(2, 0, "Port 2 -> Port 0")
-        total_passed += passed
-        total_failed += failed
+            # Print summary
+            self._log.info("\n" + "=" * 60)
+            self._log.info("Test Summary")
+            self._log.info("=" * 60)
+            self._log.info(f"Total Tests:  {total_passed + total_failed}")
+            self._log.info(f"Passed:       {total_passed}")
+            self._log.info(f"Failed:       {total_failed}")
+            total_tests = total_passed + total_failed
+            if total_tests > 0:
+                self._log.info(f"Success Rate: {100.0 * total_passed / total_tests:.1f}%")
+            else:
+                self._log.info("Success Rate: N/A (no tests run)")
+            self._log.info("=" * 60)
         
-        # Test Port 2 -> Port 4
-        passed, failed = self.test_port_pair(1, 3, "Port 1 -> Port 3")
-        total_passed += passed
-        total_failed += failed
-        
-        # Test Port 4 -> Port 2
-        passed, failed = self.test_port_pair(3, 1, "Port 3 -> Port 1")
-        total_passed += passed
-        total_failed += failed
-        
-        # Print summary
-        print("\n" + "=" * 60)
-        print("Test Summary")
-        print("=" * 60)
-        print(f"Total Tests:  {total_passed + total_failed}")
-        print(f"Passed:       {total_passed}")
-        print(f"Failed:       {total_failed}")
-        total_tests = total_passed + total_failed
-        if total_tests > 0:
-            print(f"Success Rate: {100.0 * total_passed / total_tests:.1f}%")
-        else:
-            print("Success Rate: N/A (no tests run)")
-        print("=" * 60)
-        
-        if total_failed > 0:
-            print("\nFailed Tests:")
-            for result in self.test_results:
-                if result['result'] != 'PASS':
-                    actual_str = f"0x{result['actual']:02X}" if result['actual'] is not None else 'ERROR'
-                    print(f"  {result['test']}: Pattern 0x{result['pattern']:02X} - "
-                          f"Expected 0x{result['expected']:02X}, "
-                          f"Got {actual_str}")
-        
-        return total_failed == 0
+            if total_failed == 0:
+                return True
+            
+            self._print_failures()
+            return False
 
 
-def main():
-    """Main function to run the loopback test."""
-    import argparse
-    
-    parser = argparse.ArgumentParser(
-        description='NI PCIe-6535 Loopback Test Program',
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
+_USAGE = """\
+usage: loopback_test.py [-h] [--device DEVICE] [--fast]
+
+NI PCIe-6535 Loopback Test Program
+
+options:
+  -h, --help            show this help message and exit
+  -d, --device DEVICE   NI DAQ device name (default: Dev1)
+  --fast                Test with walking 1s/0s and alternating bits only
+
 Hardware Setup:
   Connect the following ports for loopback testing:
     - Port 0 to Port 2 (all 8 channels)
@@ -260,21 +575,44 @@ Examples:
   
   # Run test with specific device
   python loopback_test.py --device Dev2
-        """
-    )
-    
-    parser.add_argument(
-        '--device',
-        default='Dev1',
-        help='NI DAQ device name (default: Dev1)'
-    )
-    
-    args = parser.parse_args()
+  
+  # Run the reduced pattern set
+  python loopback_test.py --fast"""
+
+
+def _usage_error(message):
+    """Print usage and an error message to stderr, then exit with code 2."""
+    print(_USAGE, file=sys.stderr)
+    print(f"\nerror: {message}", file=sys.stderr)
+    sys.exit(2)
+
+
+def main():
+    """Main function to run the loopback test."""
+    device = 'Dev1'
+    fast_mode = False
+    args = sys.argv[1:]
+    while args:
+        arg = args.pop(0)
+        if arg in ('-h', '--help'):
+            print(_USAGE)
+            sys.exit(0)
+        elif arg in ('-d', '--device'):
+            if not args:
+                _usage_error(f"argument {arg}: expected one argument")
+            device = args.pop(0)
+        elif arg.startswith('--device='):
+            device = arg.partition('=')[2]
+        elif arg == '--fast':
+            fast_mode = True
+        else:
+            _usage_error(f"unrecognized argument: {arg}")
     
     try:
         # Create and run test
-        test = NI6535LoopbackTest(device_name=args.device)
-        success = test.run_tests()
+        with NI6535LoopbackTest(device_name=device,
+                                fast_mode=fast_mode) as test:
+            success = test.run_tests()
         
         # Exit with appropriate code
         sys.exit(0 if success else 1)